@@ -1,72 +1,129 @@
 # streamlit_app.py
-# Title: Voice test (Compact mobile + logging + GitHub sync via Streamlit Secret)
+# Title: Voice test (Compact mobile + optional logging + GitHub sync via Streamlit Secret)
 """
 Streamlit app that:
-- Records voice and converts to text (Faster-Whisper base/int8)
+- Records voice and converts to text (Faster-Whisper base.en/auto by default, Vosk optional)
 - Shows only the latest transcription in the editor
-- Logs **all** transcriptions to a session-scoped file: `msg/chat-ddmmyy-hhmmss.txt`
-- Pushes the log file to your GitHub repo via the REST API using the SSH deploy key stored in Streamlit Secrets.
+- Optionally logs **all** transcriptions to a session-scoped file: `msg/chat-ddmmyy-hhmmss.txt`
+- Optionally pushes the log file to your GitHub repo via the REST API using the token stored in Streamlit Secrets.
 
-Secrets format (`.streamlit/secrets.toml`):
+Secrets format (`.streamlit/secrets.toml`), all keys optional:
 
-    [github]
+    log = true            # write the session log (default: true)
+
+    [github]              # presence enables GitHub sync
     token = "ssh-deploy-key"
 
 Dependencies (requirements.txt):
     streamlit==1.39.0
     streamlit-mic-recorder==0.0.8
-    faster-whisper==1.0.3
+    faster-whisper==1.1.0
+    numpy>=1.24.0
+    soundfile>=0.12.1
+    scipy>=1.10.0
     typing-extensions>=4.10.0
     requests>=2.31.0
 
+Optional (for offline/CPU-light STT):
+    pip install vosk
+    # Download a small English-accent model (e.g., en-in) from Vosk and set its path in the sidebar.
+    pip install streamlit-webrtc
+    # Enables the sidebar "Live transcription" mode (Faster-Whisper only).
+
 Run:
     streamlit run streamlit_app.py
 """
 
 import base64
+import hashlib
+import importlib.util
 import io
+import json
+import logging
 import os
-import tempfile
-from typing import Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Optional
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import streamlit as st
 
+# Leave one core for the Streamlit server; CTranslate2 reads OMP_NUM_THREADS at import
+CPU_THREADS = max(1, (os.cpu_count() or 2) - 1)
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREADS))
+# Concurrent transcriptions across sessions (Whisper calls beyond WHISPER_REPLICAS queue in CTranslate2)
+STT_WORKERS = 2
+
 st.set_page_config(page_title="Voice test", page_icon="🎙️", layout="centered")
 
 # --- Styling for compact UI ---
-st.markdown(
-    """
-    <style>
-    .small-btn button {padding: 0.25rem 0.6rem; font-size: 0.85rem; min-width: auto;}
-    .stTextArea textarea {font-size: 1rem;}
-    .block-container {padding-top: 1rem; padding-bottom: 1.5rem;}
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# Emitted on full reruns only (a skipped element would be dropped from the page);
+# mic/editor interactions rerun the fragment below and never re-send it.
+_CSS: Final[str] = """
+<style>
+.small-btn button {padding: 0.25rem 0.6rem; font-size: 0.85rem; min-width: auto;}
+.stTextArea textarea {font-size: 1rem;}
+.block-container {padding-top: 1rem; padding-bottom: 1.5rem;}
+</style>
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 st.title("Voice test")
 st.caption("Microphone → Speech-to-Text → Editable text. Submit is a dummy.")
 
 # --- Import libraries ---
-try:
-    from faster_whisper import WhisperModel  # type: ignore
-except Exception:
-    WhisperModel = None  # type: ignore
+# faster-whisper (CTranslate2, onnxruntime, PyAV) is imported lazily by the model
+# factories, so Vosk-only sessions never pay for it
+_HAS_FASTER_WHISPER = importlib.util.find_spec("faster_whisper") is not None
 
 try:
     from streamlit_mic_recorder import mic_recorder  # type: ignore
 except Exception:
     mic_recorder = None  # type: ignore
 
+try:
+    import vosk  # type: ignore
+    _HAS_VOSK = True
+except Exception:
+    vosk = None  # type: ignore
+    _HAS_VOSK = False
+
+try:
+    from streamlit_webrtc import WebRtcMode, webrtc_streamer  # type: ignore
+    _HAS_WEBRTC = True
+except Exception:
+    webrtc_streamer = WebRtcMode = None  # type: ignore
+    _HAS_WEBRTC = False
+
+
+# --- Feature switches ---
+def _secret(key: str, default=None):
+    try:
+        return st.secrets.get(key, default)
+    except FileNotFoundError:  # no secrets.toml at all
+        return default
+
+
+ENABLE_LOG = bool(_secret("log", True))
+ENABLE_GH = ENABLE_LOG and _secret("github") is not None
+# CTranslate2 replicas split CPU_THREADS between them: more sessions decode at once, each
+# one slower. Off by default; raise it only for hosts that serve several users at a time.
+WHISPER_REPLICAS = max(1, int(_secret("whisper_replicas", 1)))
+
 # --- GitHub constants ---
 GH_REPO = "UnniAmbady/voice-test-1"
 GH_BRANCH = "main"
 GH_COMMIT_NAME = "Streamlit Sync Bot"
 GH_COMMIT_EMAIL = "streamlit-sync@users.noreply.github.com"
 
+_log = logging.getLogger(__name__)
+
 # --- GitHub helpers ---
 @st.cache_resource(show_spinner=False)
 def _gh_cfg():
@@ -74,39 +131,207 @@ def _gh_cfg():
     return token, GH_REPO, GH_BRANCH, GH_COMMIT_NAME, GH_COMMIT_EMAIL
 
 
+@st.cache_resource(show_spinner=False)
+def _gh_session(token: str) -> requests.Session:
+    # One pooled keep-alive session so each sync reuses the TLS connection
+    s = requests.Session()
+    s.headers.update({
+        "Authorization": f"Bearer {token}",  # works with PAT too
+        "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.2))
+    s.mount("https://", adapter)
+    return s
+
+
 def _gh_get_sha(token: str, repo: str, branch: str, path: str) -> Optional[str]:
     url = f"https://api.github.com/repos/{repo}/contents/{path}?ref={branch}"
-    r = requests.get(url, headers={"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json"}, timeout=15)
+    r = _gh_session(token).get(url, timeout=15)
     if r.status_code == 200:
         return r.json().get("sha")
     return None
 
 
+@st.cache_resource(show_spinner=False)
+def _gh_sync_state() -> dict:
+    # remote path -> (content hash, blob sha) of the last successful push
+    return {}
+
+
 def _gh_put_file(token: str, repo: str, branch: str, path: str, content_bytes: bytes, message: str) -> bool:
     url = f"https://api.github.com/repos/{repo}/contents/{path}"
-    sha = _gh_get_sha(token, repo, branch, path)
+    digest = hashlib.blake2b(content_bytes, digest_size=16).hexdigest()
+    state = _gh_sync_state()
+    last = state.get(path)
+    if last and last[0] == digest:
+        return True  # unchanged since the last push
+
+    sha = last[1] if last else _gh_get_sha(token, repo, branch, path)
     payload = {
         "message": message,
         "branch": branch,
-        "content": base64.b64encode(content_bytes).decode("utf-8"),
+        # The Contents API needs base64; the Git Data API would avoid it but costs 4 calls per push
+        "content": base64.b64encode(memoryview(content_bytes)).decode("ascii"),
     }
     if sha:
         payload["sha"] = sha
 
-    headers = {
-        "Authorization": f"Bearer {token}",  # works with PAT too
-        "Accept": "application/vnd.github+json"
-    }
-    r = requests.put(url, json=payload, headers=headers, timeout=20)
+    r = _gh_session(token).put(url, json=payload, timeout=20)
+    if r.status_code in (409, 422):
+        # Cached sha is stale (or missing); refetch once and retry
+        sha = _gh_get_sha(token, repo, branch, path)
+        if sha:
+            payload["sha"] = sha
+            r = _gh_session(token).put(url, json=payload, timeout=20)
 
     if r.status_code not in (200, 201):
-        st.error(f"GitHub sync failed: {r.status_code} – {r.text}")
+        # May run on the background sync thread, so log instead of st.error
+        _log.warning("GitHub sync failed: %s – %s", r.status_code, r.text)
         return False
+    state[path] = (digest, r.json().get("content", {}).get("sha"))
     return True
 
 
+@st.cache_resource(show_spinner=False)
+def _gh_queue() -> queue.Queue:
+    q: queue.Queue = queue.Queue()
+
+    def worker() -> None:
+        while True:
+            jobs = [q.get()]
+            while True:
+                try:
+                    jobs.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            # Coalesce: only the newest snapshot of each file needs pushing
+            latest = {job[3]: job for job in jobs}
+            for job in latest.values():
+                try:
+                    _gh_put_file(*job)
+                except Exception:
+                    _log.exception("GitHub sync failed")
+            for _ in jobs:
+                q.task_done()
+
+    threading.Thread(target=worker, name="gh-sync", daemon=True).start()
+    return q
+
+
+
+# --- Audio decoding ---
+def _resample(x: np.ndarray, sr: int) -> np.ndarray:
+    """Resample mono audio at ``sr`` Hz to 16 kHz float32."""
+    if sr != 16000:
+        # Polyphase FIR resampling: no JIT warm-up (unlike resampy) and exact for 48k/44.1k
+        from math import gcd
+        from scipy.signal import resample_poly  # type: ignore
+
+        g = gcd(sr, 16000)
+        x = resample_poly(x, 16000 // g, sr // g)
+    return x.astype(np.float32, copy=False)
+
+
+def _decode_wav(wav_bytes: bytes) -> np.ndarray:
+    """Decode WAV bytes into the float32 mono 16 kHz array faster-whisper expects."""
+    import soundfile as sf  # type: ignore
+
+    data, sr = sf.read(io.BytesIO(wav_bytes), dtype="float32", always_2d=False)
+    if data.ndim == 2:
+        data = data.mean(axis=1)
+    return _resample(data, sr)
+
+
+# mic_recorder hands back the last clip on every rerun; reuse its decode on editor edits
+@st.cache_data(max_entries=4, show_spinner=False)
+def _prepare_audio(wav_bytes: bytes) -> tuple[np.ndarray, bytes]:
+    """Decode a recording once; return the STT array and a compact 16 kHz mono WAV for playback."""
+    import soundfile as sf  # type: ignore
+
+    pcm = _decode_wav(wav_bytes)
+    buf = io.BytesIO()
+    sf.write(buf, pcm, 16000, subtype="PCM_16", format="WAV")
+    return pcm, buf.getvalue()
+
+
+# --- Model cache ---
+@st.cache_resource(show_spinner=False)
+def _whisper_device() -> str:
+    try:
+        import ctranslate2  # type: ignore
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except Exception:
+        return "cpu"
+
+
+# Bounded so switching sizes/compute types in the sidebar can't pile up models in RAM.
+# Every model lives here: callers go through load_whisper() so one model has one key.
+@st.cache_resource(show_spinner="Loading Whisper model...", max_entries=2)
+def get_whisper(size: str, compute_type: str, device: str):
+    from faster_whisper import WhisperModel, download_model  # type: ignore
+
+    # "auto" lets CTranslate2 pick the fastest supported type for the host
+    kwargs = dict(
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=max(1, CPU_THREADS // WHISPER_REPLICAS),
+        num_workers=WHISPER_REPLICAS,
+    )
+    # Fetch the checkpoint separately so only a missing one triggers the fallback;
+    # an unsupported compute type from CTranslate2 still surfaces as is
+    try:
+        model_path = download_model(size)
+    except Exception:
+        # English-only checkpoint unavailable; fall back to the multilingual one
+        if not size.endswith(".en"):
+            raise
+        _log.warning("Whisper checkpoint %s unavailable, using %s", size, size[:-3], exc_info=True)
+        model_path = download_model(size[:-3])
+    model = WhisperModel(model_path, **kwargs)
+
+    # The first transcribe() initialises CT2 kernels and the tokenizer; pay it here,
+    # off the first recording. A failed warm-up must not take the app down.
+    try:
+        silence = np.zeros(16000, dtype=np.float32)
+        list(model.transcribe(silence, language="en", beam_size=1, vad_filter=False)[0])
+    except Exception:
+        _log.warning("Whisper warm-up failed", exc_info=True)
+    return model
+
+
+@st.cache_resource(show_spinner=False)
+def _whisper_oom() -> set:
+    # (size, compute_type) pairs that ran out of memory; shared by all sessions
+    return set()
+
+
+def _whisper_target(size: str, compute_type: str) -> tuple[str, str]:
+    if (size, compute_type) in _whisper_oom():
+        return "int8", "cpu"
+    return compute_type, _whisper_device()
+
+
+def load_whisper(size: str = "base.en", compute_type: str = "auto"):
+    return get_whisper(size, *_whisper_target(size, compute_type))
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    # CTranslate2 and Vosk release the GIL while decoding
+    return ThreadPoolExecutor(max_workers=STT_WORKERS, thread_name_prefix="stt")
+
+
+@st.cache_resource(show_spinner="Loading Vosk model...", max_entries=2)
+def get_vosk_model(path: str):
+    return vosk.Model(path)
+
 
 # --- Helpers for logging ---
+LOG_FLUSH_EVERY = 5  # entries
+LOG_FLUSH_SECS = 10.0
+
+
 def _ensure_log_path() -> str:
     if "log_file_path" not in st.session_state:
         session_stamp = datetime.now().strftime("%d%m%y-%H%M%S")
@@ -114,124 +339,447 @@ def _ensure_log_path() -> str:
         msg_dir = os.path.join(base_dir, "msg")
         os.makedirs(msg_dir, exist_ok=True)
         st.session_state.log_file_path = os.path.join(msg_dir, f"chat-{session_stamp}.txt")
-        with open(st.session_state.log_file_path, "a", encoding="utf-8") as f:
-            f.write(f"=== Session start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
+        # The in-memory buffer is the source of truth; the file is flushed in batches
+        st.session_state.log_buf = io.StringIO()
+        st.session_state.log_buf.write(f"=== Session start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
+        st.session_state.log_flushed = 0
+        st.session_state.log_flush_ts = 0.0
+        _flush_log(force=True)
     return st.session_state.log_file_path
 
 
+def _flush_log(force: bool = False) -> None:
+    pending = st.session_state.log_buf.getvalue()[st.session_state.log_flushed:]
+    if not pending:
+        return
+    due = pending.count("\n") >= LOG_FLUSH_EVERY or time.monotonic() - st.session_state.log_flush_ts >= LOG_FLUSH_SECS
+    if not (force or due):
+        return
+    with open(st.session_state.log_file_path, "a", encoding="utf-8") as f:
+        f.write(pending)
+    st.session_state.log_flushed += len(pending)
+    st.session_state.log_flush_ts = time.monotonic()
+
+
 def _log_text(text: str) -> None:
-    path = _ensure_log_path()
+    _ensure_log_path()
     ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{ts}] {text}\n")
+    st.session_state.log_buf.write(f"[{ts}] {text}\n")
+    # Without GitHub sync the file is the only copy, and the app may not rerun again
+    # before the session ends: write it now instead of waiting for the next batch
+    _flush_log(force=not ENABLE_GH)
 
 
-def _sync_log_to_github() -> bool:
+def _log_snapshot() -> Optional[tuple]:
+    if not ENABLE_GH:
+        return None
     token, repo, branch, name, email = _gh_cfg()
     if not token:
-        return False
+        return None
     local_path = _ensure_log_path()
-    try:
-        with open(local_path, "rb") as f:
-            data = f.read()
-    except FileNotFoundError:
-        return False
+    data = st.session_state.log_buf.getvalue().encode("utf-8")
     remote_path = os.path.relpath(local_path, start=os.getcwd()).replace("\\", "/")
     message = f"Update {remote_path} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ok = _gh_put_file(token, repo, branch, remote_path, data, message)
-    return ok
+    return token, repo, branch, remote_path, data, message
 
 
-# --- Session state ---
-if "transcribed_text" not in st.session_state:
-    st.session_state.transcribed_text = ""
-if "recorder_key" not in st.session_state:
-    st.session_state.recorder_key = 0
+def _sync_log_to_github() -> bool:
+    job = _log_snapshot()
+    if job is None:
+        return False
+    return _gh_put_file(*job)
+
+
+def _queue_log_sync() -> bool:
+    """Push the log on the background sync thread; returns False if sync is not configured."""
+    job = _log_snapshot()
+    if job is None:
+        return False
+    _gh_queue().put(job)
+    return True
+
+
+# --- Transcription ---
+WHISPER_OPTIONS = dict(
+    language="en",
+    task="transcribe",
+    beam_size=1,
+    best_of=1,
+    temperature=0.0,
+    condition_on_previous_text=False,
+    vad_filter=True,
+    vad_parameters=dict(
+        threshold=0.5,
+        min_speech_duration_ms=250,
+        min_silence_duration_ms=500,
+        speech_pad_ms=200,
+        max_speech_duration_s=29.0,
+    ),
+    chunk_length=30,
+    without_timestamps=True,
+    word_timestamps=False,
+)
+
+
+VAD_MIN_SECONDS = 8.0  # shorter clips skip Silero VAD; it costs more than it trims
+BATCH_MIN_SECONDS = 10.0
+BATCH_SIZE = 8
+
 
-_ensure_log_path()
+def _stream_segments(model, pcm: np.ndarray, partial: list, **extra) -> str:
+    # BatchedInferencePipeline pops keys from vad_parameters; never hand it the shared dict
+    opts = {**WHISPER_OPTIONS, "vad_parameters": dict(WHISPER_OPTIONS["vad_parameters"]), **extra}
+    segments, info = model.transcribe(pcm, **opts)
+    # Publish segments as the decoder emits them; the UI polls this list
+    for seg in segments:
+        partial.append(seg.text)
+    return " ".join(partial).strip()
 
-# --- Record control ---
-st.subheader("Record your voice")
 
-if st.button("Start new recording", key="btn_start", help="Flush text and record", use_container_width=False):
-    st.session_state.transcribed_text = ""
+def _decode_clip(model, pcm: np.ndarray, partial: list) -> str:
+    if len(pcm) > BATCH_MIN_SECONDS * 16000:
+        # Longer clips: decode the VAD-cut segments in parallel batches. The pipeline
+        # is a thin wrapper; building it per clip keeps the cached model the only copy.
+        from faster_whisper import BatchedInferencePipeline  # type: ignore
+
+        pipeline = BatchedInferencePipeline(model=model)
+        return _stream_segments(pipeline, pcm, partial, batch_size=BATCH_SIZE)
+    return _stream_segments(model, pcm, partial, vad_filter=len(pcm) > VAD_MIN_SECONDS * 16000)
+
+
+def run_whisper(pcm: np.ndarray, size: str = "base.en", compute_type: str = "auto", partial: Optional[list] = None) -> str:
+    """Transcribe with Whisper; safe to run off the script thread (no st.* calls)."""
+    partial = [] if partial is None else partial
+    model = load_whisper(size, compute_type)
+    try:
+        return _decode_clip(model, pcm, partial)
+    except RuntimeError as e:
+        if "out of memory" not in str(e).lower():
+            raise
+        # Remember the OOM so later calls (and the sidebar preload) go straight to CPU,
+        # and evict only the model that failed
+        failed = _whisper_target(size, compute_type)
+        _whisper_oom().add((size, compute_type))
+        del model
+        get_whisper.clear(size, *failed)
+        partial.clear()
+        return _decode_clip(load_whisper(size, compute_type), pcm, partial)
+
+
+def run_vosk(pcm: np.ndarray, model_path: str) -> str:
+    # 16-bit mono PCM at 16 kHz (Vosk friendly)
+    frames = (np.clip(pcm, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+    model = get_vosk_model(model_path)
+    rec = vosk.KaldiRecognizer(model, 16000)
+
+    # Feed raw PCM frames in ~2 s chunks (fewer Python -> C calls)
+    step = 65536
+    mv = memoryview(frames)
+    for i in range(0, len(mv), step):
+        rec.AcceptWaveform(bytes(mv[i:i + step]))
+
+    res = json.loads(rec.FinalResult())
+    return (res.get("text") or "").strip()
+
+
+# --- Live (streaming) transcription ---
+LIVE_STEP_SECONDS = 1.28  # new audio per hypothesis update
+LIVE_MAX_BUFFER_SECONDS = 15.0  # trim the buffer at a segment boundary past this
+
+
+def _frame_to_mono(frame) -> np.ndarray:
+    arr = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    if frame.format.is_planar:
+        arr = arr.mean(axis=0)
+    else:
+        arr = arr.reshape(-1, channels).mean(axis=1)
+    if frame.format.name.startswith("s16"):
+        arr = arr / 32768.0
+    return arr.astype(np.float32)
+
+
+def _common_prefix(a: list, b: list) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def _live_state() -> dict:
+    # buf: 16 kHz audio since the last trim; raw: frames not yet resampled into buf
+    return {"committed": "", "words": [], "buf": np.zeros(0, dtype=np.float32), "raw": [], "raw_sr": 0}
+
+
+def _drain_raw(live: dict) -> None:
+    if not live["raw"]:
+        return
+    chunk = _resample(np.concatenate(live["raw"]), live["raw_sr"])
+    live["raw"] = []
+    live["buf"] = np.concatenate([live["buf"], chunk])
+
+
+def live_transcribe(size: str, compute_type: str) -> None:
+    """Transcribe while recording; words are committed once two hypotheses agree (LocalAgreement-2)."""
+    ctx = webrtc_streamer(
+        key=f"live_{st.session_state.recorder_key}",
+        mode=WebRtcMode.SENDONLY,
+        audio_receiver_size=1024,
+        media_stream_constraints={"video": False, "audio": True},
+    )
+    # Kept in session state so audio still pending when Stop interrupts the loop survives
+    live = st.session_state.setdefault("live", _live_state())
+    opts = {**WHISPER_OPTIONS, "vad_filter": False, "without_timestamps": False}
+
+    if not ctx.state.playing:
+        # Stopped: decode the tail one last time, then whatever was heard becomes the transcript
+        _drain_raw(live)
+        words = live["words"]
+        if len(live["buf"]):
+            segments = load_whisper(size, compute_type).transcribe(live["buf"], **opts)[0]
+            words = " ".join(seg.text for seg in segments).split()
+        text = " ".join([live["committed"], *words]).strip()
+        st.session_state.live = _live_state()
+        if text:
+            _accept_transcript(text)
+        return
+
+    model = load_whisper(size, compute_type)
+    slot = st.empty()
+    shown = live["committed"]
+    while ctx.audio_receiver:
+        try:
+            frames = ctx.audio_receiver.get_frames(timeout=1)
+        except queue.Empty:
+            # Streamlit delivers the rerun from Stop only at an st.* call; without one here
+            # the loop would spin on an idle receiver and the Stop branch would never run
+            slot.markdown(shown)
+            continue
+        for f in frames:
+            live["raw"].append(_frame_to_mono(f))
+            live["raw_sr"] = f.sample_rate
+        if not live["raw"] or sum(len(r) for r in live["raw"]) < LIVE_STEP_SECONDS * live["raw_sr"]:
+            continue
+
+        _drain_raw(live)
+        buf = live["buf"]
+        segments = list(model.transcribe(buf, **opts)[0])
+        words = " ".join(seg.text for seg in segments).split()
+        stable = words[:_common_prefix(live["words"], words)]
+        live["words"] = words
+
+        if len(buf) > LIVE_MAX_BUFFER_SECONDS * 16000 and len(segments) > 1:
+            # Commit all but the last segment and drop their audio
+            live["committed"] = " ".join([live["committed"], *(seg.text.strip() for seg in segments[:-1])]).strip()
+            live["buf"] = buf[int(segments[-2].end * 16000):]
+            stable = words = live["words"] = []
+
+        tentative = words[len(stable):]
+        shown = " ".join([live["committed"], *stable, f"*{' '.join(tentative)}*" if tentative else ""])
+        slot.markdown(shown)
+
+
+def _accept_transcript(text: str) -> None:
+    st.session_state.transcript_editor = text
+    if not ENABLE_LOG:
+        st.success("Transcription added to editor below.")
+        return
+    _log_text(text)
+    if _queue_log_sync():
+        st.success("Transcription added, saved to log, and queued for GitHub sync.")
+    else:
+        st.success("Transcription added and saved to local log (GitHub sync not configured).")
+
+
+def _submit_transcription(clip: bytes, pcm: np.ndarray, wav: bytes) -> None:
+    """Start transcribing a new clip on the worker pool; the fragment polls the result."""
+    partial: list = []
+    if engine.startswith("Faster-Whisper"):
+        if not _HAS_FASTER_WHISPER:
+            st.error("faster-whisper not installed. Run: pip install faster-whisper")
+            return
+        future = get_executor().submit(run_whisper, pcm, fw_model_size, compute_type, partial)
+    elif not _HAS_VOSK:
+        st.error("vosk not installed. Run: pip install vosk")
+        return
+    elif not vosk_model_path or not os.path.isdir(vosk_model_path):
+        st.error("Please set a valid Vosk model directory in the sidebar.")
+        return
+    else:
+        future = get_executor().submit(run_vosk, pcm, vosk_model_path)
+    st.session_state.stt_job = {"clip": clip, "wav": wav, "future": future, "partial": partial, "done": False}
+
+
+# Button callbacks run before the rerun the click triggers, so no explicit st.rerun()
+def _clear_transcript() -> None:
+    st.session_state.transcript_editor = ""
+
+
+def _start_new_recording() -> None:
+    st.session_state.transcript_editor = ""
     st.session_state.recorder_key += 1
-    st.rerun()
+    st.session_state.pop("stt_job", None)  # a still-running job's result is discarded
+
+
+def render_editor() -> None:
+    st.subheader("Edit transcript")
+    # Keyed widget: Streamlit owns the text, no copy is written back on every edit
+    st.text_area("Transcript", key="transcript_editor", height=200)
+
+    c1, c2, c3 = st.columns([1, 2, 2])
+    with c1:
+        if st.button("Submit", type="primary", key="btn_submit"):
+            st.success("Submitted (dummy). No action performed.")
+    with c2:
+        st.button("Clear", key="btn_clear", on_click=_clear_transcript)
+    if ENABLE_GH:
+        with c3:
+            if st.button("Sync log to GitHub", key="btn_sync"):
+                _flush_log(force=True)
+                if _sync_log_to_github():
+                    st.success("Log synced to GitHub.")
+                else:
+                    st.warning("GitHub sync failed.")
+
+
+# --- Sidebar settings ---
+st.sidebar.header("Settings")
+engine = st.sidebar.selectbox(
+    "STT Engine",
+    options=["Faster-Whisper (recommended)", "Vosk (offline)"],
+    index=0,
+)
 
-if mic_recorder is None:
-    st.warning("streamlit-mic-recorder not installed. Run: pip install streamlit-mic-recorder")
+if engine.startswith("Faster-Whisper"):
+    fw_model_size = st.sidebar.selectbox(
+        "Whisper model size",
+        ["tiny.en", "base.en", "small.en", "tiny", "base", "small"],
+        index=1,
+        help=(
+            "Smaller = faster but less accurate. '.en' models are English-only "
+            "and faster; 'base.en' is a good default."
+        ),
+    )
+    compute_type = st.sidebar.selectbox(
+        "Compute type",
+        ["auto", "int8", "int8_float16", "float16", "int8_float32", "float32"],
+        index=0,
+        help="'auto' picks the fastest type supported by this machine.",
+    )
+    live_mode = st.sidebar.toggle(
+        "Live transcription",
+        value=False,
+        disabled=not _HAS_WEBRTC,
+        help="Stream audio and show text while you speak (needs streamlit-webrtc).",
+    )
+    if _HAS_FASTER_WHISPER:
+        try:
+            load_whisper(fw_model_size, compute_type)  # load + warm up at startup
+        except Exception as e:
+            st.error(f"Could not load Whisper model '{fw_model_size}' ({compute_type}): {e}")
 else:
-    st.write("Click **Start** to record and **Stop** when done. Transcription runs after stopping.")
-    audio = mic_recorder(
-        start_prompt="Start",
-        stop_prompt="Stop",
-        just_once=False,
-        use_container_width=False,
-        key=f"mic_{st.session_state.recorder_key}",
+    live_mode = False
+    vosk_model_path = st.sidebar.text_input(
+        "Vosk model directory",
+        value=os.environ.get("VOSK_MODEL_PATH", ""),
+        help=(
+            "Path to an extracted Vosk English model. For SEA accents, try the "
+            "small Indian English model as a starting point."
+        ),
     )
 
-    if audio:
-        wav_bytes: Optional[bytes] = None
-        if isinstance(audio, dict) and "bytes" in audio:
-            wav_bytes = audio["bytes"]
-        elif isinstance(audio, (bytes, bytearray)):
-            wav_bytes = bytes(audio)
+# --- Session state ---
+if "transcript_editor" not in st.session_state:
+    st.session_state.transcript_editor = ""
+if "recorder_key" not in st.session_state:
+    st.session_state.recorder_key = 0
 
-        if wav_bytes:
-            st.audio(wav_bytes, format="audio/wav", autoplay=False)
+if ENABLE_LOG:
+    _ensure_log_path()
+    _flush_log()
+
+# --- Record, transcribe, edit ---
+@st.fragment(run_every=0.3)
+def _poll_transcription() -> None:
+    # Reruns on its own timer, so the editor below stays live while the worker decodes
+    job = st.session_state.get("stt_job")
+    if not job or job["done"]:
+        return
+    if job["future"].done():
+        st.rerun()  # the result goes into the editor, which is drawn outside this fragment
+    st.caption("Transcribing...")
+    st.markdown(" ".join(job["partial"]))
+
+
+@st.fragment
+def record_and_transcribe() -> None:
+    # Mic stops and editor events rerun only this fragment, not the page chrome/sidebar
+    st.subheader("Record your voice")
+    if ENABLE_LOG:
+        _flush_log()  # full reruns are rare now; let fragment reruns flush due batches
+
+    st.button(
+        "Start new recording",
+        key="btn_start",
+        help="Flush text and record",
+        use_container_width=False,
+        on_click=_start_new_recording,
+    )
 
-            if WhisperModel is None:
-                st.error("faster-whisper not installed. Run: pip install faster-whisper")
+    if live_mode and _HAS_FASTER_WHISPER:
+        st.write("Press **Start** and speak; text appears as you talk. Press **Stop** to finish.")
+        live_transcribe(fw_model_size, compute_type)
+    elif mic_recorder is None:
+        st.warning("streamlit-mic-recorder not installed. Run: pip install streamlit-mic-recorder")
+    else:
+        st.write("Click **Start** to record and **Stop** when done. Transcription runs after stopping.")
+        audio = mic_recorder(
+            start_prompt="Start",
+            stop_prompt="Stop",
+            just_once=False,
+            use_container_width=False,
+            key=f"mic_{st.session_state.recorder_key}",
+        )
+
+        # streamlit-mic-recorder 0.0.8 returns {"bytes", "sample_rate", ...} or None
+        wav_bytes: Optional[bytes] = audio.get("bytes") if audio else None
+        if wav_bytes:
+            clip = hashlib.blake2b(wav_bytes, digest_size=16).digest()
+            job = st.session_state.get("stt_job")
+            if job is not None and job["clip"] == clip:
+                # Incidental rerun with the same clip: nothing to decode or transcribe
+                st.audio(job["wav"], format="audio/wav", autoplay=False)
             else:
-                with st.spinner("Transcribing..."):
-                    try:
-                        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                            tmp.write(wav_bytes)
-                            tmp.flush()
-                            tmp_path = tmp.name
-
-                        model = WhisperModel("base", compute_type="int8")
-                        segments, info = model.transcribe(tmp_path, language="en", vad_filter=True)
-                        parts = [seg.text for seg in segments]
-                        text = " ".join(parts).strip()
-                    finally:
-                        try:
-                            os.remove(tmp_path)
-                        except Exception:
-                            pass
-
-                    if text:
-                        st.session_state.transcribed_text = text
-                        _log_text(text)
-                        synced = _sync_log_to_github()
-                        if synced:
-                            st.success("Transcription added, saved to log, and synced to GitHub.")
-                        else:
-                            st.success("Transcription added and saved to local log (GitHub sync not configured).")
-                    else:
-                        st.info("No speech detected or empty result.")
-
-# --- Transcript editor ---
-st.subheader("Edit transcript")
-st.session_state.transcribed_text = st.text_area(
-    "Transcript",
-    value=st.session_state.transcribed_text,
-    height=200,
-)
+                # Downmix/resample once: the smaller WAV goes to the browser, the array to STT
+                pcm, small_wav = _prepare_audio(wav_bytes)
+                st.audio(small_wav, format="audio/wav", autoplay=False)
+                _submit_transcription(clip, pcm, small_wav)
+
+        job = st.session_state.get("stt_job")
+        if job and not job["done"] and not job["future"].done():
+            _poll_transcription()
+        elif job and not job["done"]:
+            job["done"] = True
+            try:
+                text = job["future"].result()
+            except Exception as e:
+                # e.g. a compute type this host can't run; report it like the sidebar preload does
+                st.error(f"Transcription failed: {e}")
+            else:
+                if text:
+                    _accept_transcript(text)
+                else:
+                    st.info("No speech detected or empty result.")
+
+    render_editor()
+
 
-c1, c2, c3 = st.columns([1, 2, 2])
-with c1:
-    if st.button("Submit", type="primary", key="btn_submit"):
-        st.success("Submitted (dummy). No action performed.")
-with c2:
-    if st.button("Clear", key="btn_clear"):
-        st.session_state.transcribed_text = ""
-        st.rerun()
-with c3:
-    if st.button("Sync log to GitHub", key="btn_sync"):
-        if _sync_log_to_github():
-            st.success("Log synced to GitHub.")
-        else:
-            st.warning("GitHub sync failed or not configured.")
-
-st.caption("Logs are written to ./msg/chat-<ddmmyy-hhmmss>.txt (session-scoped). Uses Streamlit Secret [github.token] for sync.")
+record_and_transcribe()
+
+if ENABLE_LOG:
+    st.caption("Logs are written to ./msg/chat-<ddmmyy-hhmmss>.txt in batches (session-scoped). Uses Streamlit Secret [github.token] for sync.")
+else:
+    st.caption("Compact single-panel mobile UI. Logging is off (set `log = true` in Streamlit Secrets to enable).")